@@ -2,28 +2,209 @@
 import sqlite3
 import os
 import importlib
+import threading
 from collections import defaultdict
-import heapq
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+
+_SETTINGS_MTIME = None
+_DB_PATH = None
+
+# Shared HTTPS session so repeated ESI / SSO calls reuse kept-alive connections
+_ESI_SESSION = requests.Session()
+_ESI_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504))
+))
+
+# Character locations keyed by character_id: (expires_at, location)
+_LOCATION_CACHE = {}
+_LOCATION_CACHE_TTL = 5
+
+# Sorted name lists used by the search-as-you-type lookups
+_NAME_INDEX_QUERIES = {
+    'systems': """
+        SELECT solarSystemName, solarSystemID
+        FROM solar_systems
+        WHERE solarSystemName IS NOT NULL
+        ORDER BY solarSystemName
+    """,
+    'stations': """
+        SELECT stationName, stationID, solarSystemID
+        FROM stations
+        WHERE stationName IS NOT NULL
+        ORDER BY stationName
+    """,
+}
+# {kind: (db_version, [(lowercase_name, name, values), ...], {trigram: [position, ...]})}
+_NAME_INDEX = {}
+
+# Per-thread SQLite connection reused across lookups (conn, db_version)
+_TLS = threading.local()
+
+# (db_version, graph) for the last jump graph built
+_JUMP_GRAPH_CACHE = None
+# (graph, IndexedJumpGraph) derived from the cached jump graph
+_INDEXED_GRAPH_CACHE = None
+# (db_version, {system_id: (system_name, security)}) for all solar systems
+_SYSTEM_META_CACHE = None
+
+
+def _get_settings():
+    """Get settings module, reloading it only when settings.py changed on disk"""
+    global _SETTINGS_MTIME
+    import settings
+    mtime = os.stat(settings.__file__).st_mtime
+    if mtime != _SETTINGS_MTIME:
+        importlib.reload(settings)
+        _SETTINGS_MTIME = mtime
+    return settings
+
+
+def invalidate_settings():
+    """Force the next settings access to reload the settings module"""
+    global _SETTINGS_MTIME
+    _SETTINGS_MTIME = None
+
+
+def reload_config():
+    """Re-read settings.py and refresh the cached DB path"""
+    global _DB_PATH
+    invalidate_settings()
+    _DB_PATH = _get_settings().DB_PATH
 
 
 def _get_db_path():
-    """Reload and get DB_PATH from settings module"""
-    import settings
-    importlib.reload(settings)
-    return settings.DB_PATH
+    """Get DB_PATH, resolved from settings once and cached until reload_config()"""
+    if _DB_PATH is None:
+        reload_config()
+    return _DB_PATH
 
 
-def _get_connection():
-    """Get a SQLite connection"""
+def _db_version():
+    """Token that changes whenever the database file is rewritten"""
     db_path = _get_db_path()
+    try:
+        return db_path, os.path.getmtime(db_path)
+    except OSError:
+        return db_path, None
+
+
+def _open_connection(db_path):
+    """Open a SQLite connection tuned for the read-mostly route lookups"""
     os.makedirs(os.path.dirname(db_path), exist_ok=True)
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")
+    conn.execute("PRAGMA mmap_size=268435456")
     return conn
 
 
+def _get_connection():
+    """Get this thread's SQLite connection, reopening it when the database file changes"""
+    version = _db_version()
+    conn = getattr(_TLS, 'conn', None)
+    if conn is not None and _TLS.version == version:
+        return conn
+
+    close_connection()
+    conn = _open_connection(version[0])
+    # Opening may create the file or switch it to WAL, so record the version afterwards
+    _TLS.conn = conn
+    _TLS.version = _db_version()
+    return conn
+
+
+def close_connection():
+    """Close the cached SQLite connection of the calling thread, if any"""
+    conn = getattr(_TLS, 'conn', None)
+    if conn is not None:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    _TLS.conn = None
+    _TLS.version = None
+
+
+@contextmanager
+def _db_cursor():
+    """Yield a cursor on this thread's cached SQLite connection"""
+    cursor = _get_connection().cursor()
+    try:
+        yield cursor
+    finally:
+        cursor.close()
+
+
+def _get_name_index(kind, version):
+    """Get the name index for systems or stations
+
+    The index is loaded once and reused until the database file changes.
+
+    Returns:
+        tuple: ([(lowercase_name, name, values), ...] sorted by name,
+                {trigram: [positions in that list, ascending]})
+    """
+    cached = _NAME_INDEX.get(kind)
+    if cached and cached[0] == version:
+        return cached[1], cached[2]
+
+    with _db_cursor() as cursor:
+        cursor.row_factory = None
+        cursor.execute(_NAME_INDEX_QUERIES[kind])
+        entries = [(row[0].lower(), row[0], row[1:]) for row in cursor]
+
+    trigrams = defaultdict(list)
+    for position, (lowercase_name, _, _) in enumerate(entries):
+        for trigram in {lowercase_name[i:i + 3] for i in range(len(lowercase_name) - 2)}:
+            trigrams[trigram].append(position)
+    trigrams = dict(trigrams)
+
+    _NAME_INDEX[kind] = (version, entries, trigrams)
+    return entries, trigrams
+
+
+@lru_cache(maxsize=256)
+def _search_names(kind, needle, version):
+    """Case-insensitive substring search over a name index (max 5 results)
+
+    Matches LIKE '%needle%' ... ORDER BY name LIMIT 5 without touching the
+    database. Only names sharing the needle's rarest trigram are checked;
+    recent queries are memoized per database version.
+    """
+    entries, trigrams = _get_name_index(kind, version)
+
+    if len(needle) >= 3:
+        candidates = min(
+            (trigrams.get(needle[i:i + 3], ()) for i in range(len(needle) - 2)),
+            key=len
+        )
+    else:
+        candidates = range(len(entries))
+
+    matches = []
+    for position in candidates:
+        lowercase_name, name, values = entries[position]
+        if needle in lowercase_name:
+            matches.append((name, values))
+            if len(matches) == 5:
+                break
+    return tuple(matches)
+
+
 def search_solar_systems(query):
     """Search solar systems by name
 
@@ -37,29 +218,13 @@ def search_solar_systems(query):
         return {}
 
     systems = {}
-    conn = None
 
     try:
-        conn = _get_connection()
-        cursor = conn.cursor()
-
-        query_pattern = f"%{query}%"
-        cursor.execute("""
-            SELECT solarSystemName, solarSystemID
-            FROM solar_systems
-            WHERE solarSystemName LIKE ?
-            ORDER BY solarSystemName
-            LIMIT 5
-        """, (query_pattern,))
-
-        results = cursor.fetchall()
-        systems = {row['solarSystemName']: row['solarSystemID'] for row in results}
+        results = _search_names('systems', query.lower(), _db_version())
+        systems = {name: values[0] for name, values in results}
 
     except Exception as e:
         print(f"Database error: {e}")
-    finally:
-        if conn:
-            conn.close()
 
     return systems
 
@@ -77,29 +242,13 @@ def search_stations(query):
         return {}
 
     stations = {}
-    conn = None
 
     try:
-        conn = _get_connection()
-        cursor = conn.cursor()
-
-        query_pattern = f"%{query}%"
-        cursor.execute("""
-            SELECT stationName, stationID, solarSystemID
-            FROM stations
-            WHERE stationName LIKE ?
-            ORDER BY stationName
-            LIMIT 5
-        """, (query_pattern,))
-
-        results = cursor.fetchall()
-        stations = {row['stationName']: (row['stationID'], row['solarSystemID']) for row in results}
+        results = _search_names('stations', query.lower(), _db_version())
+        stations = {name: values for name, values in results}
 
     except Exception as e:
         print(f"Database error: {e}")
-    finally:
-        if conn:
-            conn.close()
 
     return stations
 
@@ -107,110 +256,252 @@ def search_stations(query):
 def build_jump_graph():
     """Build a graph of solar system jumps
 
+    The jump graph only changes with a static data import, so it is built
+    once and reused until the database file changes.
+
     Returns:
-        dict: {from_system_id: [to_system_id, ...]}
+        dict: {from_system_id: (to_system_id, ...)}
     """
-    graph = defaultdict(list)
-    conn = None
+    global _JUMP_GRAPH_CACHE
+    version = _db_version()
+    if _JUMP_GRAPH_CACHE and _JUMP_GRAPH_CACHE[0] == version:
+        return _JUMP_GRAPH_CACHE[1]
 
     try:
-        conn = _get_connection()
-        cursor = conn.cursor()
+        with _db_cursor() as cursor:
+            # Let SQLite add the reverse direction of every jump, drop the
+            # duplicates (the dump already lists most jumps both ways) and
+            # sort by source, so each adjacency tuple is one grouped run
+            cursor.row_factory = None
+            cursor.execute("""
+                SELECT fromSolarSystemID, toSolarSystemID
+                FROM solar_system_jumps
+                UNION
+                SELECT toSolarSystemID, fromSolarSystemID
+                FROM solar_system_jumps
+                ORDER BY 1, 2
+            """)
+
+            # Tuples keep the shared cached graph from being mutated
+            graph = {
+                from_system: tuple(map(itemgetter(1), jumps))
+                for from_system, jumps in groupby(cursor, key=itemgetter(0))
+            }
+
+    except Exception as e:
+        print(f"Database error: {e}")
+        return {}
+
+    _JUMP_GRAPH_CACHE = (version, graph)
+    return graph
 
-        cursor.execute("""
-            SELECT fromSolarSystemID, toSolarSystemID
-            FROM solar_system_jumps
-        """)
 
-        jumps = cursor.fetchall()
+def get_system_meta():
+    """Get name and security of every solar system
 
-        for row in jumps:
-            graph[row['fromSolarSystemID']].append(row['toSolarSystemID'])
-            graph[row['toSolarSystemID']].append(row['fromSolarSystemID'])
+    Loaded with a single query and reused until the database file changes.
+
+    Returns:
+        dict: {system_id: (system_name, security)}
+    """
+    global _SYSTEM_META_CACHE
+    version = _db_version()
+    if _SYSTEM_META_CACHE and _SYSTEM_META_CACHE[0] == version:
+        return _SYSTEM_META_CACHE[1]
+
+    try:
+        with _db_cursor() as cursor:
+            cursor.row_factory = None
+            cursor.execute("""
+                SELECT solarSystemID, solarSystemName, security
+                FROM solar_systems
+            """)
+            system_meta = {
+                system_id: (name, float(security) if security is not None else 0.0)
+                for system_id, name, security in cursor
+            }
 
     except Exception as e:
         print(f"Database error: {e}")
-    finally:
-        if conn:
-            conn.close()
+        return {}
 
-    return graph
+    _SYSTEM_META_CACHE = (version, system_meta)
+    return system_meta
+
+
+class IndexedJumpGraph:
+    """Jump graph with solar systems mapped to contiguous indices
+
+    neighbors[i] holds the indices adjacent to system_ids[i], so a BFS can
+    keep its parents in a flat list instead of a dict keyed by system ID.
+    """
 
+    def __init__(self, graph):
+        self.system_ids = list(graph)
+        self.index_of = {system_id: index for index, system_id in enumerate(self.system_ids)}
+        self.neighbors = [
+            tuple(self.index_of[neighbor] for neighbor in graph[system_id])
+            for system_id in self.system_ids
+        ]
 
-def dijkstra_shortest_path(graph, start, end):
-    """Find shortest path using Dijkstra's algorithm
+
+def build_indexed_jump_graph():
+    """Get the cached jump graph as an IndexedJumpGraph"""
+    global _INDEXED_GRAPH_CACHE
+    graph = build_jump_graph()
+    if _INDEXED_GRAPH_CACHE is None or _INDEXED_GRAPH_CACHE[0] is not graph:
+        _INDEXED_GRAPH_CACHE = (graph, IndexedJumpGraph(graph))
+    return _INDEXED_GRAPH_CACHE[1]
+
+
+def bfs_from_source(graph, source, targets):
+    """Run a single BFS from source, stopping once every target is reached
 
     Args:
-        graph: Graph as adjacency list
-        start: Start node
-        end: End node
+        graph: IndexedJumpGraph
+        source: Start system index
+        targets: System indices whose distance from source is needed
 
     Returns:
-        tuple: (distance, path) where distance is jump count and path is list of nodes
+        tuple: (distances, parents) where distances maps each reachable target
+               index to its jump count and parents[i] is the index system i was
+               reached from (the source is its own parent, -1 if not visited)
     """
-    if start == end:
-        return 0, [start]
+    remaining = set(targets)
+    distances = {}
+    if source in remaining:
+        remaining.discard(source)
+        distances[source] = 0
+
+    neighbors = graph.neighbors
+    parents = [-1] * len(neighbors)
+    parents[source] = source
+    frontier = [source]
+    depth = 0
+
+    while frontier and remaining:
+        depth += 1
+        next_frontier = []
+        for current in frontier:
+            for neighbor in neighbors[current]:
+                if parents[neighbor] != -1:
+                    continue
+                parents[neighbor] = current
+                next_frontier.append(neighbor)
+
+                if neighbor in remaining:
+                    remaining.discard(neighbor)
+                    distances[neighbor] = depth
+                    if not remaining:
+                        return distances, parents
+        frontier = next_frontier
+
+    return distances, parents
 
-    # Priority queue: (distance, node, path)
-    queue = [(0, start, [start])]
-    visited = set()
 
-    while queue:
-        distance, current, path = heapq.heappop(queue)
+def calculate_all_pair_distances(graph, systems):
+    """Calculate shortest jump distances between all pairs of systems
 
-        if current in visited:
-            continue
+    Runs one BFS per system, searching only for the systems after it in the
+    list; jumps are symmetric, so that fills both halves of the matrix.
 
-        visited.add(current)
+    Args:
+        graph: IndexedJumpGraph
+        systems: Solar system IDs
 
-        if current == end:
-            return distance, path
+    Returns:
+        tuple: (dist_matrix, predecessors) where dist_matrix[i][j] is the jump
+               count from systems[i] to systems[j] (float('inf') if unreachable)
+               and predecessors[i] is the BFS parents list grown from systems[i]
+               (None if the system has no stargates)
+    """
+    size = len(systems)
+    dist_matrix = [[0] * size for _ in range(size)]
+    predecessors = []
+    indices = [graph.index_of.get(system_id) for system_id in systems]
+
+    for i, source in enumerate(indices):
+        if source is None:
+            distances, parents = {}, None
+        else:
+            targets = [index for index in indices[i + 1:] if index is not None]
+            distances, parents = bfs_from_source(graph, source, targets)
+        predecessors.append(parents)
+
+        for j in range(i + 1, size):
+            if systems[j] == systems[i]:
+                dist = 0
+            else:
+                dist = distances.get(indices[j], float('inf'))
+            dist_matrix[i][j] = dist
+            dist_matrix[j][i] = dist
 
-        # Explore neighbors
-        for neighbor in graph.get(current, []):
-            if neighbor not in visited:
-                heapq.heappush(queue, (distance + 1, neighbor, path + [neighbor]))
+    return dist_matrix, predecessors
 
-    # No path found
-    return float('inf'), []
 
+def reconstruct_path(graph, systems, predecessors, from_index, to_index):
+    """Rebuild the jump path between two systems from calculate_all_pair_distances trees
 
-def calculate_all_pair_distances(graph, systems):
-    """Calculate shortest distances between all pairs of systems"""
-    distances = {}
+    Args:
+        graph: IndexedJumpGraph used for calculate_all_pair_distances
+        systems: Systems list passed to calculate_all_pair_distances
+        predecessors: BFS parents returned by calculate_all_pair_distances
+        from_index: Position of the first system in systems
+        to_index: Position of the second system in systems
 
-    for i, system1 in enumerate(systems):
-        for system2 in systems[i:]:
-            if system1 == system2:
-                distances[(system1, system2)] = (0, [system1])
-                distances[(system2, system1)] = (0, [system2])
-            else:
-                dist, path = dijkstra_shortest_path(graph, system1, system2)
-                distances[(system1, system2)] = (dist, path)
-                distances[(system2, system1)] = (dist, list(reversed(path)))
+    Returns:
+        list: System IDs from systems[from_index] to systems[to_index]
+    """
+    # Each tree only covers the systems after its source, walk it backwards instead
+    if from_index > to_index:
+        path = reconstruct_path(graph, systems, predecessors, to_index, from_index)
+        path.reverse()
+        return path
+
+    if systems[from_index] == systems[to_index]:
+        return [systems[from_index]]
+
+    parents = predecessors[from_index]
+    node = graph.index_of[systems[to_index]]
+    path = [node]
+    while parents[node] != node:
+        node = parents[node]
+        path.append(node)
+    path.reverse()
+    return [graph.system_ids[index] for index in path]
 
-    return distances
 
+def optimize_route_greedy(start_system_id, destination_system_ids, dist_matrix):
+    """Optimize route using greedy nearest-neighbor algorithm
 
-def optimize_route_greedy(start_system_id, destination_system_ids, distances):
-    """Optimize route using greedy nearest-neighbor algorithm"""
+    Args:
+        start_system_id: Start system ID
+        destination_system_ids: Destination system IDs
+        dist_matrix: Jump counts indexed by position in [start] + destinations,
+                     as returned by calculate_all_pair_distances
+
+    Returns:
+        tuple: (total_jumps, route) where route is the list of visited system IDs
+    """
     if not destination_system_ids:
         return 0, [start_system_id]
 
-    current = start_system_id
-    remaining = set(destination_system_ids)
-    route = [current]
+    systems = [start_system_id] + list(destination_system_ids)
+    current = 0
+    remaining = list(range(1, len(systems)))
+    route = [start_system_id]
     total_jumps = 0
 
     while remaining:
-        nearest = min(remaining, key=lambda dest: distances.get((current, dest), (float('inf'),))[0])
-        dist = distances.get((current, nearest), (float('inf'),))[0]
+        row = dist_matrix[current]
+        nearest = min(remaining, key=row.__getitem__)
+        dist = row[nearest]
 
         if dist == float('inf'):
             return float('inf'), []
 
         total_jumps += dist
-        route.append(nearest)
+        route.append(systems[nearest])
         remaining.remove(nearest)
         current = nearest
 
@@ -223,12 +514,8 @@ def get_station_info(station_ids):
         return {}
 
     stations_info = {}
-    conn = None
 
     try:
-        conn = _get_connection()
-        cursor = conn.cursor()
-
         placeholders = ','.join(['?'] * len(station_ids))
         query = f"""
             SELECT s.stationID, s.stationName, s.solarSystemID, ss.solarSystemName, ss.security
@@ -236,9 +523,10 @@ def get_station_info(station_ids):
             JOIN solar_systems ss ON s.solarSystemID = ss.solarSystemID
             WHERE s.stationID IN ({placeholders})
         """
-        cursor.execute(query, tuple(station_ids))
+        with _db_cursor() as cursor:
+            cursor.execute(query, tuple(station_ids))
+            results = cursor.fetchall()
 
-        results = cursor.fetchall()
         for row in results:
             stations_info[row['stationID']] = {
                 'stationName': row['stationName'],
@@ -249,9 +537,6 @@ def get_station_info(station_ids):
 
     except Exception as e:
         print(f"Database error: {e}")
-    finally:
-        if conn:
-            conn.close()
 
     return stations_info
 
@@ -269,22 +554,27 @@ def optimize_courier_route(start_system_id, destination_station_ids):
         destination_system_ids = list(set(info['solarSystemID'] for info in stations_info.values()))
 
         # Build jump graph
-        graph = build_jump_graph()
+        graph = build_indexed_jump_graph()
 
         # Calculate all distances
         all_systems = [start_system_id] + destination_system_ids
-        distances = calculate_all_pair_distances(graph, all_systems)
+        dist_matrix, predecessors = calculate_all_pair_distances(graph, all_systems)
 
         # Optimize route
         total_jumps, optimized_system_order = optimize_route_greedy(
             start_system_id,
             destination_system_ids,
-            distances
+            dist_matrix
         )
 
         if total_jumps == float('inf'):
             return {'success': False, 'error': 'No valid route found'}
 
+        # Position of each system in all_systems (first occurrence)
+        system_index = {}
+        for index, system_id in enumerate(all_systems):
+            system_index.setdefault(system_id, index)
+
         # Build route with station details
         route = []
         full_path = []
@@ -299,7 +589,11 @@ def optimize_courier_route(start_system_id, destination_station_ids):
             path_segment = []
             if i > 0:
                 prev_system = optimized_system_order[i - 1]
-                jumps_from_prev, path_segment = distances.get((prev_system, system_id), (0, []))
+                # Paths are only rebuilt for the legs the route actually uses
+                from_index = system_index[prev_system]
+                to_index = system_index[system_id]
+                jumps_from_prev = dist_matrix[from_index][to_index]
+                path_segment = reconstruct_path(graph, all_systems, predecessors, from_index, to_index)
 
             if i > 0 and path_segment:
                 full_path.extend(path_segment[1:])
@@ -315,41 +609,18 @@ def optimize_courier_route(start_system_id, destination_station_ids):
                 })
 
         # Get security info for all systems in full path
-        full_path_with_security = []
-        if full_path:
-            conn = None
-            try:
-                conn = _get_connection()
-                cursor = conn.cursor()
-
-                placeholders = ','.join(['?'] * len(full_path))
-                query = f"""
-                    SELECT solarSystemID, solarSystemName, security
-                    FROM solar_systems
-                    WHERE solarSystemID IN ({placeholders})
-                """
-                cursor.execute(query, tuple(full_path))
-
-                systems_dict = {}
-                for row in cursor.fetchall():
-                    systems_dict[row['solarSystemID']] = {
-                        'system_id': row['solarSystemID'],
-                        'system_name': row['solarSystemName'],
-                        'security': float(row['security']) if row['security'] is not None else 0.0
-                    }
-
-                destination_system_ids_set = {s['system_id'] for s in route}
-                for sys_id in full_path:
-                    if sys_id in systems_dict:
-                        sys_info = systems_dict[sys_id]
-                        sys_info['is_destination'] = sys_id in destination_system_ids_set
-                        full_path_with_security.append(sys_info)
-
-            except Exception as e:
-                print(f"Error getting full path security: {e}")
-            finally:
-                if conn:
-                    conn.close()
+        system_meta = get_system_meta()
+        destination_system_ids_set = {s['system_id'] for s in route}
+        full_path_with_security = [
+            {
+                'system_id': sys_id,
+                'system_name': system_meta[sys_id][0],
+                'security': system_meta[sys_id][1],
+                'is_destination': sys_id in destination_system_ids_set
+            }
+            for sys_id in full_path
+            if sys_id in system_meta
+        ]
 
         return {
             'success': True,
@@ -368,8 +639,7 @@ def optimize_courier_route(start_system_id, destination_station_ids):
 def refresh_access_token(refresh_token):
     """Refresh EVE Online access token"""
     try:
-        import settings
-        importlib.reload(settings)
+        settings = _get_settings()
 
         url = "https://login.eveonline.com/v2/oauth/token"
         headers = {
@@ -382,14 +652,13 @@ def refresh_access_token(refresh_token):
             "client_id": settings.EVE_CLIENT_ID
         }
 
-        response = requests.post(url, headers=headers, data=data, timeout=10)
+        response = _ESI_SESSION.post(url, headers=headers, data=data, timeout=10)
         response.raise_for_status()
 
         token_data = response.json()
         access_token = token_data.get('access_token')
         expires_in = token_data.get('expires_in', 1200)
 
-        from datetime import timedelta
         token_expiry = datetime.now() + timedelta(seconds=expires_in)
 
         return {
@@ -402,9 +671,30 @@ def refresh_access_token(refresh_token):
         return None
 
 
+def _response_expiry(response, default_ttl):
+    """Get the UTC time until which an ESI response may be reused (Expires header)"""
+    expires = response.headers.get('expires')
+    if expires:
+        try:
+            expiry = parsedate_to_datetime(expires)
+            if expiry.tzinfo is None:
+                expiry = expiry.replace(tzinfo=timezone.utc)
+            return expiry
+        except (TypeError, ValueError):
+            pass
+    return datetime.now(timezone.utc) + timedelta(seconds=default_ttl)
+
+
 def get_character_location(character_id, access_token):
-    """Get character's current location from ESI"""
-    conn = None
+    """Get character's current location from ESI
+
+    Results are cached per character until the ESI Expires header (or a
+    short default TTL) passes, so repeated polls don't hit ESI or the DB.
+    """
+    cached = _LOCATION_CACHE.get(character_id)
+    if cached and datetime.now(timezone.utc) < cached[0]:
+        return cached[1]
+
     try:
         url = f"https://esi.evetech.net/latest/characters/{character_id}/location/"
         headers = {
@@ -414,7 +704,7 @@ def get_character_location(character_id, access_token):
             "datasource": "tranquility"
         }
 
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = _ESI_SESSION.get(url, headers=headers, params=params, timeout=10)
         response.raise_for_status()
 
         location_data = response.json()
@@ -423,45 +713,37 @@ def get_character_location(character_id, access_token):
         if not solar_system_id:
             return None
 
-        conn = _get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT solarSystemName
-            FROM solar_systems
-            WHERE solarSystemID = ?
-        """, (solar_system_id,))
+        system_meta = get_system_meta().get(solar_system_id)
 
-        result = cursor.fetchone()
-
-        if result:
-            return {
+        if system_meta:
+            location = {
                 'solar_system_id': solar_system_id,
-                'solar_system_name': result['solarSystemName']
+                'solar_system_name': system_meta[0]
             }
+            _LOCATION_CACHE[character_id] = (_response_expiry(response, _LOCATION_CACHE_TTL), location)
+            return location
 
         return None
 
     except Exception as e:
         print(f"Error getting character location: {e}")
         return None
-    finally:
-        if conn:
-            conn.close()
 
 
 def set_autopilot_waypoints(station_ids, access_token):
     """Set autopilot waypoints in-game via ESI API"""
     try:
         url = "https://esi.evetech.net/latest/ui/autopilot/waypoint/"
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json"
+        }
 
+        # Waypoints are appended in the order ESI receives them, so the
+        # requests must stay sequential to keep the route order intact
         for i, station_id in enumerate(station_ids):
             is_first = (i == 0)
 
-            headers = {
-                "Authorization": f"Bearer {access_token}",
-                "Content-Type": "application/json"
-            }
             params = {
                 "add_to_beginning": "true" if is_first else "false",
                 "clear_other_waypoints": "true" if is_first else "false",
@@ -469,7 +751,7 @@ def set_autopilot_waypoints(station_ids, access_token):
                 "datasource": "tranquility"
             }
 
-            response = requests.post(url, headers=headers, params=params, timeout=10)
+            response = _ESI_SESSION.post(url, headers=headers, params=params, timeout=10)
 
             if response.status_code not in [204, 200]:
                 response.raise_for_status()
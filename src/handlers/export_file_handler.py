@@ -1,29 +1,53 @@
 """File system event handler for export files"""
-import re
 from pathlib import Path
 from watchdog.events import FileSystemEventHandler
 
+# Length of the "<YYYY.MM.DD HHMMSS>" suffix before ".txt"
+_DATETIME_LENGTH = 17
+
+
+def _parse_export_filename(filename):
+    """Split an export file name into (region_name, item_name)
+
+    Expected format: <region_name>-<type_name>-<YYYY.MM.DD HHMMSS>.txt
+    The region ends at the first dash, the item name runs up to the dash
+    before the datetime. Returns None for any other file name.
+    """
+    if not filename.endswith('.txt'):
+        return None
+
+    base = filename[:-4]
+    sep = len(base) - _DATETIME_LENGTH - 1
+    if sep < 3 or base[sep] != '-':
+        return None
+
+    stamp = base[sep + 1:]
+    if not (stamp[4] == '.' and stamp[7] == '.' and stamp[10] == ' '
+            and (stamp[:4] + stamp[5:7] + stamp[8:10] + stamp[11:]).isdecimal()):
+        return None
+
+    first = base.find('-', 1)
+    if first == -1 or first + 1 >= sep:
+        return None
+
+    # Item name is everything between first dash and last dash (before datetime)
+    return base[:first], base[first + 1:sep]
+
 
 class ExportFileHandler(FileSystemEventHandler):
     """File system event handler for exported market files"""
     def __init__(self, callback):
         super().__init__()
         self.callback = callback
-        # Pattern: <region_name>-<type_name>-<datetime>.txt
-        # Use non-greedy match and extract everything between first and last dash before datetime
-        self.pattern = re.compile(r'^(.+?)-(.+)-(\d{4}\.\d{2}\.\d{2} \d{6})\.txt$')
 
     def on_created(self, event):
         """Handle new file creation"""
         if event.is_directory:
             return
 
-        filename = Path(event.src_path).name
-        match = self.pattern.match(filename)
+        parsed = _parse_export_filename(Path(event.src_path).name)
 
-        if match:
-            region_name = match.group(1)
-            # Item name is everything between first dash and last dash (before datetime)
-            item_name = match.group(2)
+        if parsed:
+            region_name, item_name = parsed
             print(f"New export file detected: {region_name} - {item_name}")
             self.callback(event.src_path, region_name, item_name)
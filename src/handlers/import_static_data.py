@@ -1,15 +1,26 @@
 """Static data import handler"""
 import sqlite3
 import os
+import shutil
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import importlib
 
+_SETTINGS_MTIME = None
+
+# Shared HTTP session so the CSV downloads reuse kept-alive connections
+_SESSION = requests.Session()
+
 
 def _get_settings():
-    """Reload and get settings from settings module"""
+    """Get settings module, reloading it only when settings.py changed on disk"""
+    global _SETTINGS_MTIME
     import settings
-    importlib.reload(settings)
+    mtime = os.stat(settings.__file__).st_mtime
+    if mtime != _SETTINGS_MTIME:
+        importlib.reload(settings)
+        _SETTINGS_MTIME = mtime
     return settings
 
 
@@ -17,6 +28,9 @@ def download_csv(url, filename, callback=None):
     """
     Download CSV file from URL
 
+    The server's ETag is kept next to the file, so an unchanged file is
+    revalidated with a conditional request instead of downloaded again.
+
     Parameters:
     url - URL to download from
     filename - local filename to save
@@ -30,18 +44,39 @@ def download_csv(url, filename, callback=None):
     if callback:
         callback(msg)
 
+    # Create data directory if it doesn't exist
+    data_dir = Path('data')
+    data_dir.mkdir(exist_ok=True)
+
+    filepath = data_dir / filename
+    etag_path = filepath.with_suffix('.etag')
+
+    headers = {}
+    if filepath.exists() and etag_path.exists():
+        headers['If-None-Match'] = etag_path.read_text().strip()
+
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
+        with _SESSION.get(url, headers=headers, timeout=30, stream=True) as response:
+            if response.status_code == 304:
+                msg = f"{filename} is up to date, using cached file"
+                print(msg)
+                if callback:
+                    callback(msg)
+                return filepath
 
-        # Create data directory if it doesn't exist
-        data_dir = Path('data')
-        data_dir.mkdir(exist_ok=True)
+            response.raise_for_status()
 
-        # Save file
-        filepath = data_dir / filename
-        with open(filepath, 'wb') as f:
-            f.write(response.content)
+            # Drop the old ETag first so an interrupted download is never revalidated
+            etag_path.unlink(missing_ok=True)
+
+            # Stream file to disk instead of holding the whole body in memory
+            response.raw.decode_content = True
+            with open(filepath, 'wb') as f:
+                shutil.copyfileobj(response.raw, f, length=64 * 1024)
+
+            etag = response.headers.get('ETag')
+            if etag:
+                etag_path.write_text(etag)
 
         msg = f"Successfully downloaded {filename}"
         print(msg)
@@ -57,6 +92,61 @@ def download_csv(url, filename, callback=None):
         raise
 
 
+def bulk_insert(cursor, table, df, batch_size=5000):
+    """
+    Insert all rows of a DataFrame into a table using batched executemany
+
+    Parameters:
+    cursor - database cursor
+    table - target table name (DataFrame columns must match table columns)
+    df - pandas DataFrame to insert
+    batch_size - number of rows sent per executemany call
+
+    Returns:
+    int - number of inserted rows
+    """
+    columns = ', '.join(df.columns)
+    placeholders = ', '.join(['?'] * len(df.columns))
+    sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+
+    # Replace NaN with None for the whole frame at once instead of per cell
+    rows = list(df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
+    for start in range(0, len(rows), batch_size):
+        cursor.executemany(sql, rows[start:start + batch_size])
+
+    return len(rows)
+
+
+def import_csv(cursor, table, filepath, chunksize=20000):
+    """
+    Import a CSV file into a table, reading and inserting it in chunks
+
+    Only the columns the table stores are parsed, and at most chunksize
+    rows are held in memory at a time.
+
+    Parameters:
+    cursor - database cursor
+    table - target table name (must already exist)
+    filepath - path to the CSV file
+    chunksize - number of CSV rows parsed per chunk
+
+    Returns:
+    int - number of inserted rows
+    """
+    # Import pandas only when needed
+    import pandas as pd
+
+    cursor.execute(f"PRAGMA table_info({table})")
+    table_columns = {row[1] for row in cursor.fetchall()}
+
+    count = 0
+    with pd.read_csv(filepath, usecols=lambda column: column in table_columns,
+                     chunksize=chunksize) as reader:
+        for chunk in reader:
+            count += bulk_insert(cursor, table, chunk)
+    return count
+
+
 def import_static_data(callback=None):
     """
     Download and import static data (regions and types) into SQLite database
@@ -74,7 +164,7 @@ def import_static_data(callback=None):
         if callback:
             callback(message)
 
-    # Reload settings to get fresh configuration
+    # Picks up settings.py edits made since the last import
     settings = _get_settings()
 
     log("="*60)
@@ -84,12 +174,22 @@ def import_static_data(callback=None):
 
     # Download CSV files
     try:
-        regions_file = download_csv(settings.REGIONS_DF, 'mapRegions.csv', callback)
-        types_file = download_csv(settings.TYPES_DF, 'invTypes.csv', callback)
-        market_groups_file = download_csv(settings.MARKET_GROUPS_DF, 'invMarketGroups.csv', callback)
-        stations_file = download_csv(settings.STATIONS_DF, 'staStations.csv', callback)
-        solar_systems_file = download_csv(settings.SOLAR_SYSTEMS_DF, 'mapSolarSystems.csv', callback)
-        solar_system_jumps_file = download_csv(settings.SOLAR_SYSTEM_JUMPS_DF, 'mapSolarSystemJumps.csv', callback)
+        downloads = [
+            (settings.REGIONS_DF, 'mapRegions.csv'),
+            (settings.TYPES_DF, 'invTypes.csv'),
+            (settings.MARKET_GROUPS_DF, 'invMarketGroups.csv'),
+            (settings.STATIONS_DF, 'staStations.csv'),
+            (settings.SOLAR_SYSTEMS_DF, 'mapSolarSystems.csv'),
+            (settings.SOLAR_SYSTEM_JUMPS_DF, 'mapSolarSystemJumps.csv'),
+        ]
+        # The files are independent, so fetch them all at once
+        with ThreadPoolExecutor(max_workers=len(downloads)) as executor:
+            futures = [
+                executor.submit(download_csv, url, filename, callback)
+                for url, filename in downloads
+            ]
+            (regions_file, types_file, market_groups_file, stations_file,
+             solar_systems_file, solar_system_jumps_file) = [future.result() for future in futures]
     except Exception as e:
         log(f"\nFailed to download files: {e}")
         return False
@@ -105,27 +205,15 @@ def import_static_data(callback=None):
         log("Connecting to SQLite database...")
         conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
+        # Bulk-load settings: WAL with synchronous=NORMAL only syncs at
+        # checkpoints, and a large page cache keeps index pages in memory
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-200000")
         log("Successfully connected to SQLite")
         log("")
 
-        # Read CSV files
-        log("Reading CSV files...")
-        # Import pandas only when needed
-        import pandas as pd
-        regions_df = pd.read_csv(regions_file)
-        types_df = pd.read_csv(types_file)
-        market_groups_df = pd.read_csv(market_groups_file)
-        stations_df = pd.read_csv(stations_file)
-        solar_systems_df = pd.read_csv(solar_systems_file)
-        solar_system_jumps_df = pd.read_csv(solar_system_jumps_file)
-        log(f"Loaded {len(regions_df)} regions")
-        log(f"Loaded {len(types_df)} item types")
-        log(f"Loaded {len(market_groups_df)} market groups")
-        log(f"Loaded {len(stations_df)} stations")
-        log(f"Loaded {len(solar_systems_df)} solar systems")
-        log(f"Loaded {len(solar_system_jumps_df)} solar system jumps")
-        log("")
-
         # Create regions table
         log("Creating regions table...")
         cursor.execute("""
@@ -279,156 +367,73 @@ def import_static_data(callback=None):
 
         # Import regions
         log("Importing regions data...")
-        region_count = 0
-        for index, row in regions_df.iterrows():
-            values = tuple(None if pd.isna(val) else val for val in row)
-            placeholders = ', '.join(['?'] * len(row))
-            columns = ', '.join(row.index)
-            sql = f"INSERT INTO regions ({columns}) VALUES ({placeholders})"
-            cursor.execute(sql, values)
-            region_count += 1
-
-            if region_count % 10 == 0:
-                log(f"  Imported {region_count}/{len(regions_df)} regions...")
-
-        log(f"Successfully imported {region_count} regions")
+        count = import_csv(cursor, 'regions', regions_file)
+        log(f"Successfully imported {count} regions")
         log("")
 
         # Import types
         log("Importing types data...")
-        type_count = 0
-        for index, row in types_df.iterrows():
-            values = tuple(None if pd.isna(val) else val for val in row)
-            placeholders = ', '.join(['?'] * len(row))
-            columns = ', '.join(row.index)
-            sql = f"INSERT INTO types ({columns}) VALUES ({placeholders})"
-            cursor.execute(sql, values)
-            type_count += 1
-
-            if type_count % 1000 == 0:
-                log(f"  Imported {type_count}/{len(types_df)} types...")
-
-        log(f"Successfully imported {type_count} item types")
+        count = import_csv(cursor, 'types', types_file)
+        log(f"Successfully imported {count} item types")
         log("")
 
         # Import market groups
         log("Importing market_groups data...")
-        mg_count = 0
-        for index, row in market_groups_df.iterrows():
-            values = tuple(None if pd.isna(val) else val for val in row)
-            placeholders = ', '.join(['?'] * len(row))
-            columns = ', '.join(row.index)
-            sql = f"INSERT INTO market_groups ({columns}) VALUES ({placeholders})"
-            cursor.execute(sql, values)
-            mg_count += 1
-
-            if mg_count % 1000 == 0:
-                log(f"  Imported {mg_count}/{len(market_groups_df)} market groups...")
-
-        log(f"Successfully imported {mg_count} market groups")
+        count = import_csv(cursor, 'market_groups', market_groups_file)
+        log(f"Successfully imported {count} market groups")
         log("")
 
         # Import stations
         log("Importing stations data...")
-        station_count = 0
-        for index, row in stations_df.iterrows():
-            values = tuple(None if pd.isna(val) else val for val in row)
-            placeholders = ', '.join(['?'] * len(row))
-            columns = ', '.join(row.index)
-            sql = f"INSERT INTO stations ({columns}) VALUES ({placeholders})"
-            cursor.execute(sql, values)
-            station_count += 1
-
-            if station_count % 500 == 0:
-                log(f"  Imported {station_count}/{len(stations_df)} stations...")
-
-        log(f"Successfully imported {station_count} stations")
+        count = import_csv(cursor, 'stations', stations_file)
+        log(f"Successfully imported {count} stations")
         log("")
 
         # Import solar systems
         log("Importing solar_systems data...")
-        solar_system_count = 0
-        for index, row in solar_systems_df.iterrows():
-            values = tuple(None if pd.isna(val) else val for val in row)
-            placeholders = ', '.join(['?'] * len(row))
-            columns = ', '.join(row.index)
-            sql = f"INSERT INTO solar_systems ({columns}) VALUES ({placeholders})"
-            cursor.execute(sql, values)
-            solar_system_count += 1
-
-            if solar_system_count % 500 == 0:
-                log(f"  Imported {solar_system_count}/{len(solar_systems_df)} solar systems...")
-
-        log(f"Successfully imported {solar_system_count} solar systems")
+        count = import_csv(cursor, 'solar_systems', solar_systems_file)
+        log(f"Successfully imported {count} solar systems")
         log("")
 
         # Import solar system jumps
         log("Importing solar_system_jumps data...")
-        jump_count = 0
-        for index, row in solar_system_jumps_df.iterrows():
-            values = tuple(None if pd.isna(val) else val for val in row)
-            placeholders = ', '.join(['?'] * len(row))
-            columns = ', '.join(row.index)
-            sql = f"INSERT INTO solar_system_jumps ({columns}) VALUES ({placeholders})"
-            cursor.execute(sql, values)
-            jump_count += 1
-
-            if jump_count % 1000 == 0:
-                log(f"  Imported {jump_count}/{len(solar_system_jumps_df)} jumps...")
-
-        log(f"Successfully imported {jump_count} solar system jumps")
-        log("")
-
-        # Commit transaction
-        conn.commit()
-        log("All changes committed to database")
+        count = import_csv(cursor, 'solar_system_jumps', solar_system_jumps_file)
+        log(f"Successfully imported {count} solar system jumps")
         log("")
 
         # Fill topGroupID - find the root group for each market group
         log("Calculating topGroupID for market groups...")
 
-        # Get all groups with their parent relationships
+        # Walk down from the top groups inside SQLite; a parent that is missing
+        # from the table counts as the top group of everything below it
         cursor.execute("""
-            SELECT marketGroupID, parentGroupID
-            FROM market_groups
+            WITH RECURSIVE roots(marketGroupID, topGroupID) AS (
+                SELECT marketGroupID, COALESCE(parentGroupID, marketGroupID)
+                FROM market_groups
+                WHERE parentGroupID IS NULL
+                   OR parentGroupID NOT IN (SELECT marketGroupID FROM market_groups)
+                UNION ALL
+                SELECT m.marketGroupID, r.topGroupID
+                FROM market_groups m
+                JOIN roots r ON m.parentGroupID = r.marketGroupID
+            )
+            UPDATE market_groups
+            SET topGroupID = (
+                SELECT roots.topGroupID
+                FROM roots
+                WHERE roots.marketGroupID = market_groups.marketGroupID
+            )
         """)
-        all_groups = {row[0]: row[1] for row in cursor.fetchall()}
-
-        # Function to find top group for a given group
-        def find_top_group(group_id, visited=None):
-            if visited is None:
-                visited = set()
-
-            # Prevent infinite loops
-            if group_id in visited:
-                return group_id
-            visited.add(group_id)
-
-            parent_id = all_groups.get(group_id)
-
-            # If no parent, this is the top group
-            if parent_id is None:
-                return group_id
-
-            # Recursively find the top group
-            return find_top_group(parent_id, visited)
+        update_count = cursor.rowcount
 
-        # Update topGroupID for each group
-        update_count = 0
-        for group_id in all_groups.keys():
-            top_group_id = find_top_group(group_id)
-            cursor.execute("""
-                UPDATE market_groups
-                SET topGroupID = ?
-                WHERE marketGroupID = ?
-            """, (top_group_id, group_id))
-            update_count += 1
-
-            if update_count % 100 == 0:
-                log(f"  Updated topGroupID for {update_count}/{len(all_groups)} groups...")
+        log(f"Successfully updated topGroupID for {update_count} market groups")
+        log("")
 
+        # Commit the whole import as a single transaction
         conn.commit()
-        log(f"Successfully updated topGroupID for {update_count} market groups")
+        # Fold the WAL back into the database file so it doesn't linger at import size
+        cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        log("All changes committed to database")
         log("")
 
         log("="*60)
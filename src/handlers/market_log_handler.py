@@ -1,6 +1,6 @@
 """File system event handler for market logs"""
+import os
 import re
-from pathlib import Path
 from watchdog.events import FileSystemEventHandler
 
 
@@ -9,14 +9,19 @@ class MarketLogHandler(FileSystemEventHandler):
     def __init__(self, callback):
         super().__init__()
         self.callback = callback
-        self.pattern = re.compile(r'^(.+)-(.+)-\d{4}\.\d{2}\.\d{2} \d{6}\.txt$')
+        # Market log names are plain ASCII, so skip Unicode-aware matching
+        self.pattern = re.compile(r'^(.+)-(.+)-\d{4}\.\d{2}\.\d{2} \d{6}\.txt$', re.ASCII)
 
     def on_created(self, event):
         """Handle new file creation"""
         if event.is_directory:
             return
 
-        filename = Path(event.src_path).name
+        filename = os.path.basename(event.src_path)
+        # Cheap extension check before running the regex on unrelated files
+        if not filename.endswith('.txt'):
+            return
+
         match = self.pattern.match(filename)
 
         if match:
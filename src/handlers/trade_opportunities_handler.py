@@ -1,25 +1,94 @@
 """Trade opportunities handler for fetching and managing market orders"""
 import sqlite3
 import os
+import orjson
 import requests
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import importlib
 from datetime import datetime
+from itertools import chain
+from operator import itemgetter
+
+_SETTINGS_MTIME = None
+
+# Shared HTTPS session so ESI requests reuse kept-alive connections;
+# transient ESI errors are retried with backoff instead of losing the page
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=['GET'],
+    ),
+))
+
+# Concurrent ESI requests when fetching order pages
+ESI_MAX_WORKERS = 8
+# Pause fetching when fewer ESI errors than this are left in the current window
+ESI_ERROR_LIMIT_MIN = 10
+
+# Column definitions of the orders_{region_id} tables
+_ORDERS_COLUMNS = """
+    order_id INTEGER PRIMARY KEY,
+    duration INTEGER,
+    is_buy_order INTEGER,
+    issued TEXT,
+    location_id INTEGER,
+    min_volume INTEGER,
+    price REAL,
+    range TEXT,
+    system_id INTEGER,
+    type_id INTEGER,
+    volume_remain INTEGER,
+    volume_total INTEGER,
+    fetched_at TEXT
+"""
+
+# ESI order fields stored as-is; issued is converted separately.
+# is_buy_order is a bool, which sqlite3 stores as 0/1.
+_ORDER_FIELDS = (
+    'order_id', 'duration', 'is_buy_order', 'location_id', 'min_volume', 'price',
+    'range', 'system_id', 'type_id', 'volume_remain', 'volume_total',
+)
+_order_values = itemgetter(*_ORDER_FIELDS)
+
+# Rows fetched per batch when exporting opportunities to CSV
+CSV_EXPORT_BATCH_SIZE = 10000
 
 
 def _get_settings():
-    """Reload and get settings from settings module"""
+    """Get settings module, reloading it only when settings.py changed on disk"""
+    global _SETTINGS_MTIME
     import settings
-    importlib.reload(settings)
+    mtime = os.stat(settings.__file__).st_mtime
+    if mtime != _SETTINGS_MTIME:
+        importlib.reload(settings)
+        _SETTINGS_MTIME = mtime
     return settings
 
 
+def invalidate_settings():
+    """Force the next settings access to reload the settings module"""
+    global _SETTINGS_MTIME
+    _SETTINGS_MTIME = None
+
+
 def _get_connection(settings):
-    """Get a SQLite connection"""
+    """Get a SQLite connection tuned for bulk order loads and aggregation"""
     db_path = settings.DB_PATH
     os.makedirs(os.path.dirname(db_path), exist_ok=True)
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")
+    conn.execute("PRAGMA mmap_size=268435456")
     return conn
 
 
@@ -70,6 +139,144 @@ def check_orders_count(region_id, callback=None):
             conn.close()
 
 
+def _issued_to_sql(issued):
+    """
+    Convert an ESI ISO 8601 timestamp to the "YYYY-MM-DD HH:MM:SS" stored format
+
+    ESI always sends "YYYY-MM-DDTHH:MM:SSZ", which only needs re-slicing;
+    anything else goes through the full ISO parser.
+    """
+    if len(issued) >= 19 and issued[10] == 'T':
+        return issued[:10] + ' ' + issued[11:19]
+    issued_dt = datetime.fromisoformat(issued.replace('Z', '+00:00'))
+    return issued_dt.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _fetch_orders_page(base_url, page):
+    """
+    Fetch one page of region market orders from ESI
+
+    Parameters:
+    base_url - region orders endpoint
+    page - page number
+
+    Returns:
+    tuple - (orders, total_pages); orders is None if the page does not exist
+    """
+    response = _SESSION.get(f"{base_url}?order_type=all&page={page}", timeout=30)
+    # Error responses are what spend the error budget, so honour it first
+    _wait_for_error_limit(response)
+
+    # Check if page doesn't exist
+    if response.status_code == 404:
+        try:
+            error_data = orjson.loads(response.content)
+        except ValueError:
+            # Not an ESI error body, the page is gone all the same
+            return None, 0
+        if "error" in error_data and "does not exist" in error_data["error"]:
+            return None, 0
+
+    response.raise_for_status()
+
+    return orjson.loads(response.content), int(response.headers.get('X-Pages', 1))
+
+
+def _wait_for_error_limit(response):
+    """Let the ESI error budget recover before it runs out for all workers"""
+    error_limit_remain = response.headers.get('X-ESI-Error-Limit-Remain')
+    if error_limit_remain is not None and int(error_limit_remain) < ESI_ERROR_LIMIT_MIN:
+        time.sleep(int(response.headers.get('X-ESI-Error-Limit-Reset', 1)))
+
+
+def _fetch_history_averages(region_id, type_id):
+    """
+    Fetch the market history of one type and average its last 30 days
+
+    Parameters:
+    region_id - EVE Online region ID
+    type_id - item type ID
+
+    Returns:
+    tuple - (status_code, averages); averages is (daily_orders, daily_volume),
+            or None when the request failed or the type has no history
+    """
+    api_url = f"https://esi.evetech.net/latest/markets/{region_id}/history/?datasource=tranquility&type_id={type_id}"
+    response = _SESSION.get(api_url, timeout=10)
+    _wait_for_error_limit(response)
+
+    if response.status_code != 200:
+        return response.status_code, None
+
+    history_data = orjson.loads(response.content)
+    if len(history_data) == 0:
+        return response.status_code, None
+
+    # Get last 30 days and calculate averages
+    last_30_days = history_data[-30:] if len(history_data) >= 30 else history_data
+
+    total_orders = sum(day.get('order_count', 0) for day in last_30_days)
+    total_volume = sum(day.get('volume', 0) for day in last_30_days)
+
+    daily_orders = round(total_orders / len(last_30_days))
+    daily_volume = round(total_volume / len(last_30_days))
+    return response.status_code, (daily_orders, daily_volume)
+
+
+def _fetch_order_pages(base_url, log):
+    """
+    Fetch every order page of a region, yielding (page, orders) as pages arrive
+
+    Page 1 is fetched first to read the X-Pages header, the remaining pages
+    are fetched concurrently in the background while the caller consumes
+    the pages already received. Pages that fail, including malformed JSON
+    bodies, are logged and skipped.
+    Pending downloads are cancelled when the generator is closed early.
+
+    Errors fetching page 1 are raised, so the caller can tell a region it
+    could not fetch from one that has no orders.
+    """
+    log("Fetching page 1...")
+    orders, total_pages = _fetch_orders_page(base_url, 1)
+
+    if not orders:
+        log("No orders on page 1")
+        return
+
+    if total_pages > 1:
+        log(f"Fetching pages 2-{total_pages}...")
+    executor = ThreadPoolExecutor(max_workers=ESI_MAX_WORKERS)
+    futures = {}
+    try:
+        # Submit the remaining pages before handing out page 1, so they are
+        # downloaded while the caller converts it
+        futures = {
+            executor.submit(_fetch_orders_page, base_url, page): page
+            for page in range(2, total_pages + 1)
+        }
+        yield 1, orders
+
+        for future in as_completed(futures):
+            page = futures[future]
+            try:
+                orders, _ = future.result()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                log(f"Error fetching page {page}: {e}")
+                continue
+
+            if orders is None:
+                # X-Pages drives the loop; the page count can still shrink
+                # while the region is being fetched
+                log(f"Page {page} no longer exists, skipping")
+            elif orders:
+                yield page, orders
+    finally:
+        # Closing the generator early must not wait for the pending downloads
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
 def update_orders(region_id, callback=None):
     """
     Fetch all market orders for a region from ESI API and store in database
@@ -108,23 +315,7 @@ def update_orders(region_id, callback=None):
 
         # Create table if doesn't exist
         log(f"Creating table {table_name} if not exists...")
-        cursor.execute(f"""
-            CREATE TABLE IF NOT EXISTS [{table_name}] (
-                order_id INTEGER PRIMARY KEY,
-                duration INTEGER,
-                is_buy_order INTEGER,
-                issued TEXT,
-                location_id INTEGER,
-                min_volume INTEGER,
-                price REAL,
-                range TEXT,
-                system_id INTEGER,
-                type_id INTEGER,
-                volume_remain INTEGER,
-                volume_total INTEGER,
-                fetched_at TEXT
-            )
-        """)
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS [{table_name}] ({_ORDERS_COLUMNS})")
         # Add fetched_at to existing tables that pre-date the column
         try:
             cursor.execute(f"ALTER TABLE [{table_name}] ADD COLUMN fetched_at TEXT")
@@ -134,85 +325,75 @@ def update_orders(region_id, callback=None):
         log(f"Table {table_name} ready")
         log("")
 
-        # Clear table
-        log(f"Clearing existing data from {table_name}...")
-        cursor.execute(f"DELETE FROM [{table_name}]")
-        log("Table cleared")
-        log("")
-
         # Fetch orders from ESI API
         log("Fetching orders from ESI API...")
         base_url = f"https://esi.evetech.net/latest/markets/{region_id}/orders/"
-        page = 1
         total_orders = 0
 
-        while True:
-            url = f"{base_url}?order_type=all&page={page}"
-            log(f"Fetching page {page}...")
-
-            try:
-                response = requests.get(url, timeout=30)
-
-                # Check if page doesn't exist
-                if response.status_code == 404:
-                    error_data = response.json()
-                    if "error" in error_data and "does not exist" in error_data["error"]:
-                        log(f"Reached last page (page {page} does not exist)")
-                        break
-
-                response.raise_for_status()
-                orders = response.json()
+        # Pages are loaded into a staging table as they arrive, one short
+        # transaction per page, while the remaining pages keep downloading.
+        # The live table is only replaced once every page is in, so a failed
+        # refresh keeps the previous snapshot.
+        staging_name = f"{table_name}_new"
+        cursor.execute(f"DROP TABLE IF EXISTS [{staging_name}]")
+        cursor.execute(f"CREATE TABLE [{staging_name}] ({_ORDERS_COLUMNS})")
+
+        # Orders can shift between pages while paginating, so the same
+        # order_id may arrive twice; keep the latest copy
+        insert_sql = f"""
+            INSERT OR REPLACE INTO [{staging_name}]
+            ({', '.join(_ORDER_FIELDS)}, issued)
+            VALUES ({', '.join('?' * (len(_ORDER_FIELDS) + 1))})
+        """
 
-                if not orders:
-                    log(f"No more orders on page {page}")
-                    break
+        # Page 1 errors are raised by the first next(); an empty region is
+        # still stored, but one that could not be fetched keeps its orders
+        pages = _fetch_order_pages(base_url, log)
+        try:
+            first_page = next(pages, None)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            log(f"Error fetching page 1: {e}")
+            log("No orders fetched, keeping existing data")
+            cursor.execute(f"DROP TABLE IF EXISTS [{staging_name}]")
+            return False
 
+        try:
+            for page, orders in chain([first_page] if first_page else [], pages):
                 # Insert orders into database
                 log(f"  Inserting {len(orders)} orders from page {page}...")
-                for order in orders:
-                    # Convert ISO 8601 datetime format
-                    issued_dt = datetime.fromisoformat(order['issued'].replace('Z', '+00:00'))
-                    issued_str = issued_dt.strftime("%Y-%m-%d %H:%M:%S")
-
-                    cursor.execute(f"""
-                        INSERT OR REPLACE INTO [{table_name}]
-                        (order_id, duration, is_buy_order, issued, location_id,
-                         min_volume, price, range, system_id, type_id,
-                         volume_remain, volume_total)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        order['order_id'],
-                        order['duration'],
-                        1 if order['is_buy_order'] else 0,
-                        issued_str,
-                        order['location_id'],
-                        order['min_volume'],
-                        order['price'],
-                        order['range'],
-                        order['system_id'],
-                        order['type_id'],
-                        order['volume_remain'],
-                        order['volume_total']
-                    ))
+                rows = [
+                    _order_values(order) + (_issued_to_sql(order['issued']),)
+                    for order in orders
+                ]
+                cursor.executemany(insert_sql, rows)
+                conn.commit()
 
                 total_orders += len(orders)
                 log(f"  Total orders fetched: {total_orders}")
+        finally:
+            pages.close()
+        log("")
 
-                # Commit after each page
-                conn.commit()
-
-                page += 1
+        # Stamp every row with the fetch timestamp; this also opens the
+        # transaction the swap below runs in
+        now_iso = datetime.now().isoformat()
+        cursor.execute(f"UPDATE [{staging_name}] SET fetched_at = ?", (now_iso,))
 
-                # Pause between requests (1 second)
-                time.sleep(1)
+        # Swap the staging table in
+        log(f"Replacing {table_name} with the fetched orders...")
+        cursor.execute(f"DROP TABLE [{table_name}]")
+        cursor.execute(f"ALTER TABLE [{staging_name}] RENAME TO [{table_name}]")
 
-            except requests.exceptions.RequestException as e:
-                log(f"Error fetching page {page}: {e}")
-                break
+        # Covers every column find_opportunities aggregates, in type_id order,
+        # so the opportunities query never has to touch the table itself.
+        # Built once on the full table rather than maintained while loading
+        cursor.execute(f"""
+            CREATE INDEX [idx_{table_name}_type]
+            ON [{table_name}] (type_id, is_buy_order, duration, price, issued)
+        """)
 
-        # Stamp every row with the fetch timestamp
-        now_iso = datetime.now().isoformat()
-        cursor.execute(f"UPDATE [{table_name}] SET fetched_at = ?", (now_iso,))
+        # The timestamp, the swap and the index are committed together, so
+        # readers see either the previous snapshot or the complete new one
         conn.commit()
 
         log("")
@@ -225,6 +406,10 @@ def update_orders(region_id, callback=None):
         log(f"Database error: {e}")
         if conn:
             conn.rollback()
+            try:
+                conn.execute(f"DROP TABLE IF EXISTS [orders_{region_id}_new]")
+            except sqlite3.Error:
+                pass  # Replaced by the next refresh anyway
         return False
     finally:
         if conn:
@@ -333,14 +518,18 @@ def find_opportunities(region_id, min_sell_price, max_buy_price, min_profit_perc
         log(f"Selected market groups: {selected_market_groups}")
         log(f"Max competitors: {max_competitors}")
 
-        # Build the query with optional market groups filter
-        market_groups_join = ""
+        # Build the query with optional market groups filter. The matching
+        # type_ids are resolved first, so only their orders are scanned
         market_groups_filter = ""
 
         if selected_market_groups and len(selected_market_groups) > 0:
-            market_groups_join = "JOIN market_groups mg ON mg.marketGroupID = t.marketGroupID"
             placeholders = ', '.join(['?'] * len(selected_market_groups))
-            market_groups_filter = f"AND mg.topGroupID IN ({placeholders})"
+            market_groups_filter = f"""AND o.type_id IN (
+                    SELECT gt.typeID
+                    FROM types gt
+                    JOIN market_groups mg ON mg.marketGroupID = gt.marketGroupID
+                    WHERE mg.topGroupID IN ({placeholders})
+                )"""
             log(f"Filtering by {len(selected_market_groups)} market group(s): {selected_market_groups}")
 
         # Build competitors filter
@@ -370,21 +559,16 @@ def find_opportunities(region_id, min_sell_price, max_buy_price, min_profit_perc
                 NULL as qty_avg
             FROM [{orders_table}] o
             JOIN types t ON t.typeID = o.type_id
-            WHERE o.type_id IN (
-                SELECT
-                    o.type_id
-                FROM [{orders_table}] o
-                JOIN types t ON t.typeID = o.type_id
-                {market_groups_join}
-                WHERE o.duration < 365
-                    AND o.is_buy_order = 0
-                    {market_groups_filter}
-                GROUP BY o.type_id
-                HAVING MIN(CASE WHEN o.is_buy_order = 0 THEN price END) > ?
-                    AND MIN(CASE WHEN o.is_buy_order = 0 THEN price END) < ?
-            )
-            GROUP BY o.type_id, t.typeName
-            HAVING profit > ? AND profit < ? {competitors_filter}
+            WHERE 1 = 1
+                {market_groups_filter}
+            -- typeName follows from type_id; grouping by type_id alone lets
+            -- SQLite walk the orders index instead of sorting
+            GROUP BY o.type_id
+            -- The price range only looks at sell orders shorter than 365 days,
+            -- so it is checked on its own aggregate in the same pass
+            HAVING MIN(CASE WHEN o.is_buy_order = 0 AND o.duration < 365 THEN o.price END) > ?
+                AND MIN(CASE WHEN o.is_buy_order = 0 AND o.duration < 365 THEN o.price END) < ?
+                AND profit > ? AND profit < ? {competitors_filter}
             ORDER BY o.type_id
         """
 
@@ -410,73 +594,66 @@ def find_opportunities(region_id, min_sell_price, max_buy_price, min_profit_perc
         log("")
 
         log("Populating daily statistics from history...")
-        for idx, type_id in enumerate(type_ids, 1):
-            if idx % 10 == 0 or idx == 1:
-                log(f"Processing {idx}/{len(type_ids)}: type_id {type_id}")
-
-            # Check if data exists in history table (created within last 3 days)
-            cursor.execute(f"""
-                SELECT order_count, volume
-                FROM [{history_table}]
-                WHERE type_id = ? AND julianday('now') - julianday(created_at) < 3
-            """, (type_id,))
-
-            history_row = cursor.fetchone()
-
-            if history_row:
-                # Use existing history data
-                daily_orders = history_row[0]
-                daily_volume = history_row[1]
-            else:
-                # Fetch from API and calculate averages
-                try:
-                    api_url = f"https://esi.evetech.net/latest/markets/{region_id}/history/?datasource=tranquility&type_id={type_id}"
-                    response = requests.get(api_url, timeout=10)
-
-                    if response.status_code == 200:
-                        history_data = response.json()
-
-                        # Get last 30 days and calculate averages
-                        if len(history_data) > 0:
-                            last_30_days = history_data[-30:] if len(history_data) >= 30 else history_data
-
-                            total_orders = sum(day.get('order_count', 0) for day in last_30_days)
-                            total_volume = sum(day.get('volume', 0) for day in last_30_days)
-
-                            daily_orders = round(total_orders / len(last_30_days))
-                            daily_volume = round(total_volume / len(last_30_days))
-
-                            # Insert or update history table
-                            cursor.execute(f"""
-                                INSERT INTO [{history_table}] (type_id, order_count, volume, created_at)
-                                VALUES (?, ?, ?, datetime('now'))
-                                ON CONFLICT(type_id) DO UPDATE SET
-                                    order_count = excluded.order_count,
-                                    volume = excluded.volume,
-                                    created_at = datetime('now')
-                            """, (type_id, daily_orders, daily_volume))
-                        else:
-                            daily_orders = 0
-                            daily_volume = 0
-                    else:
-                        log(f"  Warning: API request failed for type_id {type_id} (status {response.status_code})")
-                        daily_orders = 0
-                        daily_volume = 0
-
-                    # Small delay to avoid rate limiting
-                    time.sleep(0.1)
 
+        # History rows created within the last 3 days are reused; "now" is
+        # read once so the same rows count as fresh for the update below
+        cursor.execute("SELECT julianday('now')")
+        now = cursor.fetchone()[0]
+        cursor.execute(f"""
+            SELECT o.type_id
+            FROM [{opportunities_table}] o
+            WHERE NOT EXISTS (
+                SELECT 1 FROM [{history_table}] h
+                WHERE h.type_id = o.type_id AND ? - julianday(h.created_at) < 3
+            )
+        """, (now,))
+        missing_type_ids = [row[0] for row in cursor.fetchall()]
+        log(f"Using stored history for {len(type_ids) - len(missing_type_ids)} types, "
+            f"fetching {len(missing_type_ids)} from ESI")
+
+        history_rows = []
+        with ThreadPoolExecutor(max_workers=ESI_MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(_fetch_history_averages, region_id, type_id): type_id
+                for type_id in missing_type_ids
+            }
+            for idx, future in enumerate(as_completed(futures), 1):
+                type_id = futures[future]
+                if idx % 10 == 0 or idx == 1:
+                    log(f"Processing {idx}/{len(missing_type_ids)}: type_id {type_id}")
+
+                averages = None
+                try:
+                    status_code, averages = future.result()
+                    if status_code != 200:
+                        log(f"  Warning: API request failed for type_id {type_id} (status {status_code})")
                 except Exception as e:
                     log(f"  Error fetching history for type_id {type_id}: {e}")
-                    daily_orders = 0
-                    daily_volume = 0
 
-            # Update opportunities table with daily statistics
-            cursor.execute(f"""
-                UPDATE [{opportunities_table}]
-                SET daily_orders = ?, daily_volume = ?
-                WHERE type_id = ?
-            """, (daily_orders, daily_volume, type_id))
+                if averages:
+                    history_rows.append((type_id, *averages))
+
+        # Insert or update history table
+        cursor.executemany(f"""
+            INSERT INTO [{history_table}] (type_id, order_count, volume, created_at)
+            VALUES (?, ?, ?, datetime('now'))
+            ON CONFLICT(type_id) DO UPDATE SET
+                order_count = excluded.order_count,
+                volume = excluded.volume,
+                created_at = datetime('now')
+        """, history_rows)
+
+        # Update opportunities table with daily statistics; types without
+        # fresh history (no data or a failed request) get 0
+        cursor.execute(f"""
+            UPDATE [{opportunities_table}]
+            SET (daily_orders, daily_volume) = (
+                SELECT COALESCE(MAX(h.order_count), 0), COALESCE(MAX(h.volume), 0)
+                FROM [{history_table}] h
+                WHERE h.type_id = [{opportunities_table}].type_id
+                    AND ? - julianday(h.created_at) < 3
+            )
+        """, (now,))
 
         conn.commit()
         log("Daily statistics populated successfully")
@@ -546,18 +723,19 @@ def export_opportunities_to_csv(region_id, callback=None):
             log("Please run 'Find Opportunities' first")
             return None
 
-        # Fetch data
+        # Fetch data as plain tuples in CSV column order
+        fieldnames = ['type_id', 'typeName', 'buy_orders_count', 'sell_orders_count',
+                      'min_sell_price', 'max_buy_price', 'profit', 'qty_avg']
         log(f"Fetching data from {opportunities_table}...")
-        cursor.execute(f"SELECT * FROM [{opportunities_table}]")
-        opportunities = [dict(row) for row in cursor.fetchall()]
+        cursor.row_factory = None
+        cursor.execute(f"SELECT {', '.join(fieldnames)} FROM [{opportunities_table}]")
+        # Rows are streamed to the file in batches; the first one tells whether there is anything to export
+        opportunities = cursor.fetchmany(CSV_EXPORT_BATCH_SIZE)
 
         if not opportunities:
             log("No data to export")
             return None
 
-        log(f"Found {len(opportunities)} opportunities")
-        log("")
-
         # Export to CSV
         import csv
         from datetime import datetime
@@ -579,13 +757,16 @@ def export_opportunities_to_csv(region_id, callback=None):
         log(f"Writing to {filepath}...")
 
         with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['type_id', 'typeName', 'buy_orders_count', 'sell_orders_count',
-                         'min_sell_price', 'max_buy_price', 'profit', 'qty_avg']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.writer(csvfile)
+
+            writer.writerow(fieldnames)
+            exported = 0
+            while opportunities:
+                writer.writerows(opportunities)
+                exported += len(opportunities)
+                opportunities = cursor.fetchmany(CSV_EXPORT_BATCH_SIZE)
 
-            writer.writeheader()
-            for opp in opportunities:
-                writer.writerow(opp)
+        log(f"Exported {exported} opportunities")
 
         log("")
         log("="*60)